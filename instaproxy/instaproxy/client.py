@@ -6,6 +6,7 @@ See https://github.com/subzeroid/aiograpi.
 """
 
 import asyncio
+import functools
 import hashlib
 import logging
 import os
@@ -40,8 +41,10 @@ class ClientProxy:
     Proxy class for `aiograpi.Client`.
     """
 
+    __slots__ = ("account", "cl")
+
     account: Account
-    cl: Client = None
+    cl: Client
 
     def __init__(self, client: Client, account: Account) -> None:
         self.account = account
@@ -49,13 +52,11 @@ class ClientProxy:
 
     async def get_account(self) -> AccountDict:
         return AccountDict(
-            {
-                "biography": self.account.biography or "",
-                "fullName": self.account.full_name,
-                "handler": self.account.username,
-                "id": self.account.pk,
-                "pictureURL": str(self.account.profile_pic_url),
-            }
+            biography=self.account.biography or "",
+            fullName=self.account.full_name,
+            handler=self.account.username,
+            id=int(self.account.pk),
+            pictureURL=str(self.account.profile_pic_url),
         )
 
     async def get_user(
@@ -101,6 +102,11 @@ class ClientProxy:
         Return a ClientProxy instance. The instance is a singleton unless `force` is passed.
         """
         global CLIENT
+
+        # Fast path, skip the lock when the singleton is already initialised.
+        if CLIENT is not None and not force:
+            return CLIENT
+
         async with LOCK:
             if force or CLIENT is None:
                 CLIENT = await init_client()
@@ -116,6 +122,16 @@ class ClientProxy:
         CLIENT = None
 
 
+@functools.cache
+def get_session_hash(user: str) -> str:
+    """
+    Return the hash used for naming the user's session file, computed only once per user.
+
+    MD5 is kept so that session files saved by previous versions are still found, it is not used for security.
+    """
+    return hashlib.md5(user.encode(), usedforsecurity=False).hexdigest()
+
+
 def get_persistence_dir() -> Path:
     """
     Ensure the persistence folder exists and return it.
@@ -140,7 +156,7 @@ async def init_client() -> ClientProxy:
         )
 
     password_login, session_login = False, False
-    session_hash = hashlib.md5(user.encode()).hexdigest()
+    session_hash = get_session_hash(user)
 
     cl = Client(
         delay_range=[
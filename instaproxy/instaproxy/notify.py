@@ -5,18 +5,17 @@ queues so that errors can be notified to the program owner via Telegram.
 
 Care should be taken when using the `enqueue_exception()` funcction since
 Exceptions are grouped by class name, and if there are multiple exceptions of
-the same class, only the stack trace from the first exception will be sent
-along the notification.
+the same class, only the first exception is kept (and its stack trace sent
+along the notification) while the others are just counted.
 """
 
-import json
 import os
 import traceback
-from typing import DefaultDict, List
+from typing import Dict, Optional
 import aiohttp
 import asyncio
 import logging
-from collections import defaultdict
+import orjson
 
 # Telegram BOT token.
 BOT_TOKEN = os.environ["TG_BOT_TOKEN"]
@@ -24,14 +23,21 @@ BOT_TOKEN = os.environ["TG_BOT_TOKEN"]
 # Telegram channel where to notify errors.
 CHANNEL_ID = os.environ["TG_CHANNEL"]
 
-# Error queues (keys are the exceptions' class names)
-QUEUES: DefaultDict[str, asyncio.Queue[Exception]] = defaultdict(asyncio.Queue)
+# Error queues (keys are the exceptions' class names), each holding the first error not yet notified.
+QUEUES: Dict[str, asyncio.Queue[Exception]] = {}
+
+# Number of errors received for each queue since the last notification.
+COUNTS: Dict[str, int] = {}
+
+# HTTP session shared by all notifications, it is opened by `start_notifier()`.
+SESSION: Optional[aiohttp.ClientSession] = None
 
 
 def enqueue_exception(err: Exception) -> None:
     """
     Enqueue the received error, grouped by its classname.
-    If there are more than 5000 errors in the queue, this function will do nothing but log a warning.
+    If the queue already contains an error, this one is only counted: exceptions hold references to their stack
+    frames (and thus to request-scoped objects), and only the first stack trace is sent anyway.
 
     Parameters
     ----------
@@ -39,18 +45,19 @@ def enqueue_exception(err: Exception) -> None:
         The exception to enqueue for sending.
     """
     qname = err.__class__.__name__
-    queue = QUEUES[qname]
-    qsize = queue.qsize()
+    queue = QUEUES.get(qname)
+    if queue is None:
+        queue = QUEUES[qname] = asyncio.Queue()
 
-    if qsize > 5000:
-        logging.warning("Exception queue %s already contains %d errors", qname, qsize)
+    COUNTS[qname] = COUNTS.get(qname, 0) + 1
+
+    if not queue.empty():
         return
 
     queue.put_nowait(err)
 
 
-def get_message_text(errors: List[Exception]) -> str:
-    error, errors_count = errors[0], len(errors)
+def get_message_text(error: Exception, errors_count: int = 1) -> str:
     text = [
         f"💥 **Instaproxy error ({type(error).__name__}): {error}**",
         "",
@@ -76,73 +83,118 @@ async def notify_exception_group(queue: asyncio.Queue[Exception]) -> bool:
     Parameters
     ----------
     queue: asyncio.Queue
-        The queue to drain and send the notification for.
+        The queue to send the notification for, it holds at most one error (see `enqueue_exception()`).
 
     Returns
     -------
     bool
         Whether a message was sent.
     """
-    errors: List[Exception] = []
-
-    # Drain queue first
-    while True:
-        try:
-            errors.append(queue.get_nowait())
-        except asyncio.QueueEmpty:
-            break
-
-    if not errors:
+    try:
+        error = queue.get_nowait()
+    except asyncio.QueueEmpty:
         logging.warning(
             "notify_exception_group was invoked on an empty queue, skipping..."
         )
 
         return False
 
+    qname = error.__class__.__name__
+    errors_count = COUNTS.pop(qname, 0) or 1
+
     data = {
         "chat_id": CHANNEL_ID,
-        "link_preview_options": json.dumps({"is_disabled": True}),
+        "link_preview_options": orjson.dumps({"is_disabled": True}).decode(),
         "parse_mode": "MarkdownV2",
-        "text": get_message_text(errors),
+        "text": get_message_text(error, errors_count),
     }
 
+    session = SESSION or await open_session()
+    status: Optional[int] = None
+
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(
-                f"https://api.telegram.org/bot{BOT_TOKEN}/sendMessage", data=data
-            ) as response:
-                if response.status == 200:
-                    return True
-    except aiohttp.ClientError as client_exception:
+        async with session.post(
+            f"https://api.telegram.org/bot{BOT_TOKEN}/sendMessage", data=data
+        ) as response:
+            status = response.status
+            if status == 200:
+                return True
+
+            # Read the body while the response is still open.
+            body = await response.read()
+    except (aiohttp.ClientError, asyncio.TimeoutError) as client_exception:
         logging.warning("Failed to post Telegram message.")
         logging.exception(client_exception)
-
-    try:
-        resp = await response.json()
-        desc = resp["descriptions"].values()
-    except:  # noqa: E722
-        logging.warning("Failed to post Telegram message. Status: %s", response.status)
     else:
-        logging.debug("Telegram response: %s", resp)
-        logging.warning("Telegram error (%s): %s", response.status, "; ".join(desc))
-
-    if response.status >= 500:
-        # Re-queue for retry.
-        await queue.put(errors[0])
+        try:
+            resp = orjson.loads(body)
+            desc = resp["description"]
+        except (orjson.JSONDecodeError, KeyError, TypeError):
+            logging.warning("Failed to post Telegram message. Status: %s", status)
+        else:
+            logging.debug("Telegram response: %s", resp)
+            logging.warning("Telegram error (%s): %s", status, desc)
+
+    if status is None or status >= 500:
+        # Re-queue for retry, unless another error of the same class was enqueued in the meantime.
+        if queue.empty():
+            queue.put_nowait(error)
+        COUNTS[qname] = COUNTS.get(qname, 0) + errors_count
         await asyncio.sleep(30)
 
     return False
 
 
+async def open_session() -> aiohttp.ClientSession:
+    """
+    Open the HTTP session shared by all notifications, so that connections to Telegram are kept alive.
+
+    Returns
+    -------
+    aiohttp.ClientSession
+        the shared session.
+    """
+    global SESSION
+
+    if SESSION is None or SESSION.closed:
+        # At most one message is sent every 10 seconds, and always to the same host.
+        SESSION = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=2,
+                limit_per_host=2,
+                ttl_dns_cache=3600,
+                enable_cleanup_closed=True,
+            ),
+            timeout=aiohttp.ClientTimeout(total=30),
+        )
+
+    return SESSION
+
+
+async def close_session() -> None:
+    """
+    Close the shared HTTP session, if any.
+    """
+    global SESSION
+
+    if SESSION is not None:
+        await SESSION.close()
+
+    SESSION = None
+
+
 async def start_notifier() -> asyncio.Task:
     """
-    Start `watch_queues()` in a backgroung task and return such task.
+    Open the shared HTTP session, then start `watch_queues()` in a backgroung task and return such task.
+    The session is closed when the task is cancelled.
 
     Returns
     -------
     asyncio.Task
         the active background task.
     """
+    await open_session()
+
     task = asyncio.create_task(watch_queues())
 
     return task
@@ -154,21 +206,25 @@ async def watch_queues() -> None:
     This coroutine:
     - will sleep for 30 seconds if there are no queues in the dictionary
     - will sleep 10 seconds between each message
+    - will close the shared HTTP session when cancelled
     """
-    while True:
-        if not QUEUES:
-            await asyncio.sleep(30)
+    try:
+        while True:
+            if not QUEUES:
+                await asyncio.sleep(30)
 
-            continue
+                continue
 
-        for key in list(QUEUES.keys()):
-            queue = QUEUES[key]
+            for key in list(QUEUES.keys()):
+                queue = QUEUES[key]
 
-            if queue.empty():
-                del QUEUES[key]
-                continue
+                if queue.empty():
+                    del QUEUES[key]
+                    continue
 
-            sent = await notify_exception_group(queue)
-            if sent:
-                # Do not evict the queue from the dictionary here, new messages might have appeared while sending!
-                await asyncio.sleep(10)
+                sent = await notify_exception_group(queue)
+                if sent:
+                    # Do not evict the queue from the dictionary here, new messages might have appeared while sending!
+                    await asyncio.sleep(10)
+    finally:
+        await close_session()
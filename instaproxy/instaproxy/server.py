@@ -14,12 +14,14 @@ from aiograpi.exceptions import (  # type: ignore[import-untyped]
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request
 from fastapi.exceptions import HTTPException
-from fastapi.responses import JSONResponse
-from typing import Optional
-from .cache import CacheWithTTL
+from fastapi.openapi.utils import get_openapi
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+from faster_async_lru import alru_cache
+import msgspec
+from typing import Any, Dict, Optional, Union
 from .client import ClientProxy
 from .notify import enqueue_exception, start_notifier
-from .types import AccountDict, InstagramUserDict
+from .types import AccountDict, InstagramUser, InstagramUserDict, InstagramUsersPage
 
 
 # List of aiograpi exceptions for which the client should be re-instantiated.
@@ -35,6 +37,33 @@ AUTH_EXCEPTIONS = (
 NOTIFY_EXCEPTIONS = (ChallengeRequired,)
 
 
+def encode_hook(obj: Any) -> Any:
+    """Encode types that msgspec does not support natively.
+
+    InstagramUser instances are encoded via their cached `to_dict()` struct, so lists of users can be encoded
+    as they are, without building an intermediate list of dicts first.
+    """
+    if isinstance(obj, InstagramUser):
+        return obj.to_dict()
+
+    raise NotImplementedError(f"Objects of type {type(obj)} are not supported")
+
+
+# Shared msgspec encoder, see `MsgspecJSONResponse`.
+ENCODER = msgspec.json.Encoder(enc_hook=encode_hook)
+
+
+class MsgspecJSONResponse(JSONResponse):
+    """JSON response encoded with msgspec.
+
+    Endpoints return this directly so that msgspec Structs (see `types.py`) are encoded in C, skipping
+    FastAPI's own validation and serialization of the returned value.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return ENCODER.encode(content)
+
+
 @asynccontextmanager
 async def lifespan(*args, **kwargs):
     """
@@ -52,23 +81,68 @@ async def lifespan(*args, **kwargs):
 app = FastAPI(lifespan=lifespan)
 
 
-@app.get("/me")
-async def get_account() -> AccountDict:
+def openapi() -> Dict[str, Any]:
+    """Generate the OpenAPI schema, adding the msgspec Structs returned by the endpoints to its components.
+
+    See https://fastapi.tiangolo.com/how-to/extending-openapi/.
+    """
+    if not app.openapi_schema:
+        schema = get_openapi(title=app.title, version=app.version, routes=app.routes)
+
+        _, components = msgspec.json.schema_components(
+            (AccountDict, InstagramUserDict, InstagramUsersPage),
+            ref_template="#/components/schemas/{name}",
+        )
+        schema.setdefault("components", {}).setdefault("schemas", {}).update(components)
+
+        app.openapi_schema = schema
+
+    return app.openapi_schema
+
+
+app.openapi = openapi  # type: ignore[method-assign]
+
+
+def response_schema(struct: type) -> Dict[Union[int, str], Dict[str, Any]]:
+    """Document a successful response whose body is the given msgspec Struct.
+
+    Parameters
+    ----------
+    struct: type
+        The msgspec Struct, it must be listed in `openapi()`.
+
+    Returns
+    -------
+    dict
+        Value for the `responses` argument of the route decorators.
+    """
+    return {
+        200: {
+            "content": {
+                "application/json": {
+                    "schema": {"$ref": f"#/components/schemas/{struct.__name__}"},
+                },
+            },
+        },
+    }
+
+
+@app.get("/me", responses=response_schema(AccountDict))
+async def get_account() -> MsgspecJSONResponse:
     """Return information of the account currently logged in with the client.
 
     Returns
     -------
-    AccountDict
-        the account's information.
+    MsgspecJSONResponse
+        the account's information (AccountDict).
     """
     client = await ClientProxy.get()
 
-    return await client.get_account()
+    return MsgspecJSONResponse(await client.get_account())
 
 
-@app.get("/account/{handler}")
-@CacheWithTTL.decorate(ttl=60 * 10)
-async def get_user(handler: str) -> InstagramUserDict:
+@app.get("/account/{handler}", responses=response_schema(InstagramUserDict))
+async def get_user(handler: str) -> MsgspecJSONResponse:
     """Return information of the user given their @handler.
 
     Parameters
@@ -78,11 +152,22 @@ async def get_user(handler: str) -> InstagramUserDict:
 
     Returns
     -------
-    InstagramUserDict
-        the user's information.
+    MsgspecJSONResponse
+        the user's information (InstagramUserDict).
     """
-    handler = handler.strip("@")
+    if handler[:1] == "@":
+        handler = handler[1:]
+
+    return MsgspecJSONResponse(await fetch_user(handler))
+
 
+@alru_cache(maxsize=1024, ttl=60 * 10)
+async def fetch_user(handler: str) -> InstagramUserDict:
+    """Fetch the user given their handler (without the @ prefix), see `get_user()`.
+
+    Results are cached rather than the responses themselves, because FastAPI sets attributes on the response
+    objects returned by the endpoints.
+    """
     client = await ClientProxy.get()
 
     user = await client.get_user(handler=handler)
@@ -92,9 +177,8 @@ async def get_user(handler: str) -> InstagramUserDict:
     return user.to_dict()
 
 
-@app.get("/account-id/{user_id}")
-@CacheWithTTL.decorate(ttl=60 * 10)
-async def get_user_by_id(user_id: int) -> InstagramUserDict:
+@app.get("/account-id/{user_id}", responses=response_schema(InstagramUserDict))
+async def get_user_by_id(user_id: int) -> MsgspecJSONResponse:
     """Return information of the user given their ID.
 
     Parameters
@@ -104,9 +188,15 @@ async def get_user_by_id(user_id: int) -> InstagramUserDict:
 
     Returns
     -------
-    InstagramUserDict
-        the user's information.
+    MsgspecJSONResponse
+        the user's information (InstagramUserDict).
     """
+    return MsgspecJSONResponse(await fetch_user_by_id(user_id))
+
+
+@alru_cache(maxsize=1024, ttl=60 * 10)
+async def fetch_user_by_id(user_id: int) -> InstagramUserDict:
+    """Fetch the user given their ID, see `get_user_by_id()`."""
     client = await ClientProxy.get()
 
     user = await client.get_user(user_id=user_id)
@@ -116,9 +206,10 @@ async def get_user_by_id(user_id: int) -> InstagramUserDict:
     return user.to_dict()
 
 
-@app.get("/followers/{user_id}")
-@CacheWithTTL.decorate(ttl=60 * 60)
-async def get_user_followers(user_id: int, next_cursor: Optional[str] = None):
+@app.get("/followers/{user_id}", responses=response_schema(InstagramUsersPage))
+async def get_user_followers(
+    user_id: int, next_cursor: Optional[str] = None
+) -> MsgspecJSONResponse:
     """Return a paginated list of the given user's followers.
 
     Parameters
@@ -130,21 +221,30 @@ async def get_user_followers(user_id: int, next_cursor: Optional[str] = None):
 
     Returns
     -------
-    dict
-        Response data
+    MsgspecJSONResponse
+        Response data (InstagramUsersPage)
     """
+    return MsgspecJSONResponse(await fetch_user_followers(user_id, next_cursor))
+
+
+@alru_cache(maxsize=1024, ttl=60 * 60)
+async def fetch_user_followers(
+    user_id: int, next_cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    """Fetch a page of the given user's followers, see `get_user_followers()`."""
     client = await ClientProxy.get()
     followers, next = await client.get_user_followers(user_id, next_cursor=next_cursor)
 
     return {
         "next": next,
-        "users": [u.to_dict() for u in followers],
+        "users": followers,
     }
 
 
-@app.get("/following/{user_id}")
-@CacheWithTTL.decorate(ttl=60 * 60)
-async def get_user_following(user_id: int, next_cursor: Optional[str] = None):
+@app.get("/following/{user_id}", responses=response_schema(InstagramUsersPage))
+async def get_user_following(
+    user_id: int, next_cursor: Optional[str] = None
+) -> MsgspecJSONResponse:
     """Return a paginated list of the people followed by the given user.
 
     Parameters
@@ -156,51 +256,35 @@ async def get_user_following(user_id: int, next_cursor: Optional[str] = None):
 
     Returns
     -------
-    dict
-        Response data
+    MsgspecJSONResponse
+        Response data (InstagramUsersPage)
     """
+    return MsgspecJSONResponse(await fetch_user_following(user_id, next_cursor))
+
+
+@alru_cache(maxsize=1024, ttl=60 * 60)
+async def fetch_user_following(
+    user_id: int, next_cursor: Optional[str] = None
+) -> Dict[str, Any]:
+    """Fetch a page of the people followed by the given user, see `get_user_following()`."""
     client = await ClientProxy.get()
     following, next = await client.get_user_following(user_id, next_cursor=next_cursor)
 
     return {
         "next": next,
-        "users": [u.to_dict() for u in following],
+        "users": following,
     }
 
 
-def auth_exception_handler(_: Request, err: Exception) -> JSONResponse:
-    """Error handler for AUTH_EXCEPTIONS.
-    Reset the client to force a login before enqueuing the exception - it will be later sent to the notifications
-    channel.
-
-    See https://fastapi.tiangolo.com/tutorial/handling-errors/.
-
-    Parameters
-    ----------
-    _: Any
-        Not used.
-    err: Exception
-        The error.
-
-    Returns
-    -------
-    JSONResponse
-        JSON response with the error message.
-    """
-    ClientProxy.reset()
-    enqueue_exception(err)
-
-    return JSONResponse(
-        {
-            "error": repr(err),
-        },
-        status_code=500,
-    )
-
+@app.exception_handler(Exception)
+async def exception_handler(_: Request, err: Exception) -> Response:
+    """Error handler for unhandled exceptions.
+    For AUTH_EXCEPTIONS, reset the client to force a login. Both AUTH_EXCEPTIONS and NOTIFY_EXCEPTIONS are then
+    enqueued, they will be later sent to the notifications channel.
+    Other exceptions get the default "Internal Server Error" response.
 
-def notify_exception_handler(_: Request, err: Exception) -> JSONResponse:
-    """Error handler for NOTIFY_EXCEPTIONS.
-    Enqueuing the exception so it can be sent to the notifications channel.
+    A single handler is registered, dispatching with `isinstance()`, instead of one handler per exception class.
+    Starlette re-raises the exception once the response is sent, so it is still logged.
 
     See https://fastapi.tiangolo.com/tutorial/handling-errors/.
 
@@ -213,9 +297,14 @@ def notify_exception_handler(_: Request, err: Exception) -> JSONResponse:
 
     Returns
     -------
-    JSONResponse
-        JSON response with the error message.
+    Response
+        JSON response with the error message, or plain text response for other errors.
     """
+    if isinstance(err, AUTH_EXCEPTIONS):
+        ClientProxy.reset()
+    elif not isinstance(err, NOTIFY_EXCEPTIONS):
+        return PlainTextResponse("Internal Server Error", status_code=500)
+
     enqueue_exception(err)
 
     return JSONResponse(
@@ -224,10 +313,3 @@ def notify_exception_handler(_: Request, err: Exception) -> JSONResponse:
         },
         status_code=500,
     )
-
-
-for exc_class in AUTH_EXCEPTIONS:
-    app.add_exception_handler(exc_class, auth_exception_handler)
-
-for exc_class in NOTIFY_EXCEPTIONS:
-    app.add_exception_handler(exc_class, notify_exception_handler)
@@ -1,5 +1,8 @@
+import asyncio
 import os
 import pytest
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
 
 os.environ["TG_BOT_TOKEN"] = "1234"
 os.environ["TG_CHANNEL"] = "-9876"
@@ -32,19 +35,15 @@ async def test_enqueue_exception():
     notify.enqueue_exception(e2)
     notify.enqueue_exception(e3)
 
-    assert notify.QUEUES["ValueError"].qsize() == 2
+    # Only the first error is kept, the others are counted.
+    assert notify.QUEUES["ValueError"].qsize() == 1
     assert notify.QUEUES["ValueError"].get_nowait() == e2
-    assert notify.QUEUES["ValueError"].get_nowait() == e3
+    assert notify.COUNTS["ValueError"] == 3
 
 
 @pytest.mark.anyio
 async def test_get_message_text():
-    errors = [
-        TypeError("type error 1"),
-        TypeError("type error 2"),
-    ]
-
-    msg_lines = notify.get_message_text(errors).split("\n")
+    msg_lines = notify.get_message_text(TypeError("type error 1"), 2).split("\n")
 
     assert msg_lines == [
         """💥 **Instaproxy error (TypeError): type error 1**""",
@@ -56,3 +55,76 @@ async def test_get_message_text():
         "",
         "This error occurred 2 times, only the first stack trace is attached",
     ]
+
+
+@pytest.mark.anyio
+async def test_shared_session():
+    session = await notify.open_session()
+
+    assert notify.SESSION is session
+    assert await notify.open_session() is session
+
+    await notify.close_session()
+
+    assert session.closed
+    assert notify.SESSION is None
+
+
+class FakeSession:
+    def __init__(self, status, body):
+        self.response = SimpleNamespace(status=status, read=self.read)
+        self.body = body
+
+    async def read(self):
+        return self.body
+
+    @asynccontextmanager
+    async def post(self, *args, **kwargs):
+        yield self.response
+
+
+@pytest.mark.anyio
+async def test_notify_exception_group(monkeypatch):
+    queue: asyncio.Queue[Exception] = asyncio.Queue()
+    queue.put_nowait(KeyError("key error"))
+
+    monkeypatch.setattr(notify, "SESSION", FakeSession(200, b""))
+
+    assert await notify.notify_exception_group(queue) is True
+    assert queue.empty()
+
+
+@pytest.mark.anyio
+async def test_notify_exception_group_client_error(monkeypatch):
+    queue: asyncio.Queue[Exception] = asyncio.Queue()
+    queue.put_nowait(KeyError("key error"))
+
+    body = b'{"ok": false, "error_code": 400, "description": "Bad Request: can\'t parse entities"}'
+    monkeypatch.setattr(notify, "SESSION", FakeSession(400, body))
+
+    # Client errors are not retried
+    assert await notify.notify_exception_group(queue) is False
+    assert queue.empty()
+
+
+@pytest.mark.anyio
+async def test_notify_exception_group_server_error(monkeypatch):
+    async def sleep(_):
+        pass
+
+    queue: asyncio.Queue[Exception] = asyncio.Queue()
+    e0 = LookupError("lookup error")
+
+    monkeypatch.setattr(notify, "QUEUES", {"LookupError": queue})
+    monkeypatch.setattr(notify, "COUNTS", {})
+
+    notify.enqueue_exception(e0)
+    notify.enqueue_exception(LookupError("lookup error 2"))
+
+    monkeypatch.setattr(notify, "SESSION", FakeSession(502, b"Bad Gateway"))
+    monkeypatch.setattr(asyncio, "sleep", sleep)
+
+    # Server errors are re-queued for retry, along with their count
+    assert await notify.notify_exception_group(queue) is False
+    assert queue.get_nowait() == e0
+    assert notify.COUNTS["LookupError"] == 2
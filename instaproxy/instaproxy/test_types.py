@@ -1,7 +1,8 @@
 from pydantic import HttpUrl
+import msgspec
 import pytest
 from types import SimpleNamespace
-from .types import InstagramUser
+from .types import InstagramUser, InstagramUserDict
 
 
 def get_user():
@@ -29,9 +30,24 @@ async def test_attrs():
 async def test_to_dict():
     user = get_user()
 
-    assert user.to_dict() == {
+    assert user.to_dict() == InstagramUserDict(
+        fullName=user.full_name,
+        handler=user.handler,
+        id=user.user_id,
+        pictureURL=user.pic_url,
+    )
+
+    assert msgspec.json.decode(msgspec.json.encode(user.to_dict())) == {
         "fullName": user.full_name,
         "handler": user.handler,
         "id": user.user_id,
         "pictureURL": user.pic_url,
     }
+
+
+@pytest.mark.anyio
+async def test_slots():
+    user = get_user()
+
+    assert not hasattr(user, "__dict__")
+    assert user.to_dict() is user.to_dict()
@@ -10,10 +10,11 @@ See https://github.com/subzeroid/aiograpi.
 """
 
 from aiograpi.types import UserShort  # type: ignore[import-untyped]
-from typing import TypedDict
+from typing import List, Optional
+import msgspec
 
 
-class AccountDict(TypedDict):
+class AccountDict(msgspec.Struct):
     """
     JSON representation of an aiograpi.Account.
     """
@@ -25,7 +26,7 @@ class AccountDict(TypedDict):
     pictureURL: str
 
 
-class InstagramUserDict(TypedDict):
+class InstagramUserDict(msgspec.Struct):
     """
     JSON representation of an InstagramUser.
     """
@@ -36,15 +37,30 @@ class InstagramUserDict(TypedDict):
     pictureURL: str
 
 
+class InstagramUsersPage(msgspec.Struct):
+    """
+    JSON representation of a paginated list of users.
+
+    Only used for documenting the API schema, endpoints build the same payload as a dict holding InstagramUser
+    instances.
+    """
+
+    next: Optional[str]
+    users: List[InstagramUserDict]
+
+
 class InstagramUser:
     """
     Proxy class for `aiograpi` User model.
     """
 
+    __slots__ = ("full_name", "handler", "pic_url", "user_id", "_dict")
+
     full_name: str
     handler: str
     pic_url: str
     user_id: int
+    _dict: InstagramUserDict
 
     def __init__(self, api_user: UserShort):
         """
@@ -59,12 +75,13 @@ class InstagramUser:
         self.pic_url = str(api_user.profile_pic_url)
         self.user_id = int(api_user.pk)
 
-    def to_dict(self) -> InstagramUserDict:
-        return InstagramUserDict(
-            {
-                "fullName": self.full_name,
-                "handler": self.handler,
-                "id": self.user_id,
-                "pictureURL": self.pic_url,
-            }
+        # Attributes never change, so the JSON representation is built only once.
+        self._dict = InstagramUserDict(
+            fullName=self.full_name,
+            handler=self.handler,
+            id=self.user_id,
+            pictureURL=self.pic_url,
         )
+
+    def to_dict(self) -> InstagramUserDict:
+        return self._dict